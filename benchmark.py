@@ -0,0 +1,104 @@
+"""
+Pipeline throughput benchmark
+
+Runs hand tracking, gesture recognition and desktop rendering headless over
+a fixed number of frames and reports the time spent in each stage, so
+backends can be compared under the same workload:
+
+    python benchmark.py --backend synthetic --frames 600 --fps 60
+    python benchmark.py --backend mediapipe --replay session.frames.npy
+"""
+import argparse
+import time
+import numpy as np
+from hand_tracker import HandTracker
+from hand_backends import MediaPipeBackend, SyntheticBackend
+from gesture_recognizer import GestureRecognizer
+from virtual_window import VirtualDesktop
+from session_recorder import SessionReader
+
+
+def make_backend(name):
+    if name == 'synthetic':
+        return SyntheticBackend()
+    if name == 'mediapipe':
+        return MediaPipeBackend(max_hands=1)
+    raise ValueError(f"Unknown backend: {name}")
+
+
+def run_benchmark(backend, frames=300, fps=30, replay_path=None):
+    """
+    Run the pipeline and return the mean milliseconds per frame for each stage
+
+    Frames come from a recorded session if given, otherwise a blank camera
+    frame is reused. Timestamps advance at `fps` regardless of how fast the
+    pipeline actually runs.
+    """
+    tracker = HandTracker(backend=backend)
+    recognizer = GestureRecognizer()
+    desktop = VirtualDesktop(width=1280, height=720)
+
+    reader = SessionReader(replay_path, loop=True) if replay_path else None
+    blank = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    stages = {'detect': 0.0, 'recognize': 0.0, 'render': 0.0}
+    gestures = 0
+    for i in range(frames):
+        frame = reader.read()[1] if reader else blank.copy()
+        timestamp_ms = int(i * 1000 / fps)
+
+        start = time.perf_counter()
+        tracker.find_hands(frame, draw=False, timestamp_ms=timestamp_ms)
+        finger_pos = tracker.get_finger_tip_position()
+        is_pinching = tracker.is_pinching()
+        fingers_up = tracker.count_fingers_up()
+        detected = time.perf_counter()
+
+        recognizer.update(finger_pos, timestamp=timestamp_ms / 1000)
+        if fingers_up == 5 and recognizer.detect_swipe():
+            gestures += 1
+        if recognizer.detect_push() or recognizer.detect_pull():
+            gestures += 1
+        if finger_pos:
+            # Map from webcam (640x480) to desktop (1280x720), as main.py does
+            desktop_x = int((finger_pos[0] / 640) * 1280)
+            desktop_y = int((finger_pos[1] / 480) * 720)
+            desktop.handle_cursor(desktop_x, desktop_y, is_pinching)
+        recognized = time.perf_counter()
+
+        desktop.render(timestamp_ms / 1000)
+        rendered = time.perf_counter()
+
+        stages['detect'] += detected - start
+        stages['recognize'] += recognized - detected
+        stages['render'] += rendered - recognized
+
+    tracker.release()
+    if reader:
+        reader.release()
+
+    results = {name: total * 1000 / frames for name, total in stages.items()}
+    results['gestures'] = gestures
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline")
+    parser.add_argument('--backend', choices=['synthetic', 'mediapipe'], default='synthetic')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--replay', help="Recorded session to use as camera input")
+    args = parser.parse_args()
+
+    results = run_benchmark(make_backend(args.backend), args.frames, args.fps, args.replay)
+
+    total = sum(results[name] for name in ('detect', 'recognize', 'render'))
+    print(f"Backend: {args.backend}  Frames: {args.frames}  Simulated FPS: {args.fps}")
+    for name in ('detect', 'recognize', 'render'):
+        print(f"  {name:<10} {results[name]:8.3f} ms/frame")
+    print(f"  {'total':<10} {total:8.3f} ms/frame ({1000 / total:.0f} fps max)")
+    print(f"  Gestures triggered: {results['gestures']}")
+
+
+if __name__ == "__main__":
+    main()
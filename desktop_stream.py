@@ -0,0 +1,277 @@
+import socket
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# magic, frame id, base frame id (0 = keyframe), width, height, tile size, payload length
+HEADER = struct.Struct('!4sIIHHHI')
+MAGIC = b'GDSK'
+# Clients acknowledge every frame with its id
+ACK = struct.Struct('!I')
+
+
+def _tiles(frame, tile):
+    """View a frame as (tiles_y, tiles_x, tile, tile, channels), padding the edges"""
+    h, w, c = frame.shape
+    pad_h = -h % tile
+    pad_w = -w % tile
+    if pad_h or pad_w:
+        frame = np.pad(frame, ((0, pad_h), (0, pad_w), (0, 0)))
+    ty, tx = frame.shape[0] // tile, frame.shape[1] // tile
+    return frame.reshape(ty, tile, tx, tile, c).swapaxes(1, 2)
+
+
+def encode_delta(frame, previous, tile=16) -> bytes:
+    """
+    Encode the tiles of `frame` that differ from `previous`
+
+    The payload is a bitmask of changed tiles followed by the XOR of each
+    changed tile with the previous frame, zlib-compressed. With no previous
+    frame every tile is sent (XOR against black), i.e. a keyframe.
+    """
+    current = _tiles(frame, tile)
+    if previous is None:
+        changed = np.ones(current.shape[:2], dtype=bool)
+        delta = current[changed]
+    else:
+        xor = current ^ _tiles(previous, tile)
+        changed = xor.reshape(xor.shape[0], xor.shape[1], -1).any(axis=2)
+        delta = xor[changed]
+    return zlib.compress(np.packbits(changed).tobytes() + delta.tobytes(), 1)
+
+
+def decode_delta(payload, previous, shape, tile=16) -> np.ndarray:
+    """Apply an encode_delta() payload to `previous` (None for a keyframe)"""
+    h, w, c = shape
+    raw = zlib.decompress(payload)
+
+    base = np.zeros(shape, dtype=np.uint8) if previous is None else previous
+    tiles = _tiles(base, tile).copy()
+    ty, tx = tiles.shape[:2]
+
+    mask_bytes = (ty * tx + 7) // 8
+    changed = np.unpackbits(np.frombuffer(raw, np.uint8, mask_bytes))[:ty * tx].reshape(ty, tx).astype(bool)
+    delta = np.frombuffer(raw, np.uint8, offset=mask_bytes).reshape(-1, tile, tile, c)
+    tiles[changed] ^= delta
+
+    return tiles.swapaxes(1, 2).reshape(ty * tile, tx * tile, c)[:h, :w].copy()
+
+
+class _Client:
+    """One connected viewer with its own sender thread"""
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.sent_id = 0
+        self.base = None  # Last frame this client received
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.thread: Optional[threading.Thread] = None
+
+
+class DesktopStreamServer:
+    """
+    Streams rendered desktop frames to viewers over TCP
+
+    Only tiles that changed since the frame a client last received are sent.
+    publish() never blocks. Each client has one frame in flight and gets the
+    newest frame once it acknowledges the previous one, so slow clients skip
+    frames instead of buffering them.
+    """
+
+    def __init__(self, host='127.0.0.1', port=5900, tile=16):
+
+        self.tile = tile
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((host, port))
+        self.server_socket.listen()
+        self.address = self.server_socket.getsockname()
+
+        self.clients: List[_Client] = []
+        self.running = False
+        self.condition = threading.Condition()
+        self.latest: Optional[Tuple[int, np.ndarray]] = None
+        self.frame_id = 0
+
+        # Clients that are up to date share the same encoded payload
+        self.encode_lock = threading.Lock()
+        self.encode_cache: Dict[Tuple[int, int], bytes] = {}
+
+        # Statistics
+        self.frames_encoded = 0
+        self.bytes_encoded = 0
+        self.encode_seconds = 0.0
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"Streaming desktop on {self.address[0]}:{self.address[1]}")
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                sock, address = self.server_socket.accept()
+            except OSError:
+                break  # Server socket closed
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(sock, address)
+            client.thread = threading.Thread(target=self._send_loop, args=(client,), daemon=True)
+            with self.condition:
+                self.clients.append(client)
+            client.thread.start()
+
+    def publish(self, frame):
+        """Offer a rendered frame to all clients"""
+        with self.condition:
+            if not self.clients:
+                return
+            self.frame_id += 1
+            self.latest = (self.frame_id, frame.copy())
+            self.condition.notify_all()
+
+    def _encode(self, frame_id, frame, base_id, base) -> bytes:
+        key = (base_id, frame_id)
+        with self.encode_lock:
+            if key in self.encode_cache:
+                return self.encode_cache[key]
+
+            start = time.perf_counter()
+            payload = encode_delta(frame, base, self.tile)
+            self.encode_seconds += time.perf_counter() - start
+            self.frames_encoded += 1
+            self.bytes_encoded += len(payload)
+
+            # Only payloads for the newest frame can still be reused
+            self.encode_cache = {k: v for k, v in self.encode_cache.items() if k[1] == frame_id}
+            self.encode_cache[key] = payload
+            return payload
+
+    def _send_loop(self, client: _Client):
+        try:
+            while True:
+                with self.condition:
+                    while self.running and (self.latest is None or self.latest[0] == client.sent_id):
+                        self.condition.wait()
+                    if not self.running:
+                        break
+                    frame_id, frame = self.latest
+
+                if client.sent_id:
+                    client.frames_skipped += frame_id - client.sent_id - 1
+                payload = self._encode(frame_id, frame, client.sent_id, client.base)
+                h, w = frame.shape[:2]
+                header = HEADER.pack(MAGIC, frame_id, client.sent_id, w, h, self.tile, len(payload))
+                client.sock.sendall(header + payload)
+                ack = client.sock.recv(ACK.size, socket.MSG_WAITALL)
+                if len(ack) < ACK.size or ACK.unpack(ack)[0] != frame_id:
+                    break
+
+                client.sent_id = frame_id
+                client.base = frame
+                client.frames_sent += 1
+        except OSError:
+            pass  # Client disconnected
+        finally:
+            with self.condition:
+                if client in self.clients:
+                    self.clients.remove(client)
+            client.sock.close()
+
+    def stats(self) -> dict:
+        """Encoding cost and per-client delivery counts"""
+        with self.condition:
+            clients = [(c.address, c.frames_sent, c.frames_skipped) for c in self.clients]
+        return {
+            'frames_encoded': self.frames_encoded,
+            'bytes_per_frame': self.bytes_encoded / self.frames_encoded if self.frames_encoded else 0.0,
+            'encode_ms': self.encode_seconds * 1000 / self.frames_encoded if self.frames_encoded else 0.0,
+            'clients': clients,
+        }
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+            clients = list(self.clients)
+        self.server_socket.close()
+        for client in clients:
+            try:
+                client.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.thread.join(timeout=1.0)
+
+
+class DesktopStreamClient:
+    """Receives and reconstructs frames from a DesktopStreamServer"""
+
+    def __init__(self, host='127.0.0.1', port=5900):
+
+        self.sock = socket.create_connection((host, port))
+        self.frame: Optional[np.ndarray] = None
+        self.frame_id = 0
+        self.bytes_received = 0
+
+    def _recv_exact(self, size) -> Optional[bytes]:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                return None
+            data.extend(chunk)
+        return bytes(data)
+
+    def receive(self) -> Optional[np.ndarray]:
+        """Block until the next frame arrives; None when the server closes"""
+        header = self._recv_exact(HEADER.size)
+        if header is None:
+            return None
+        magic, frame_id, base_id, w, h, tile, length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Not a desktop stream")
+        if base_id != self.frame_id:
+            raise ValueError(f"Frame {frame_id} is based on {base_id}, but have {self.frame_id}")
+
+        payload = self._recv_exact(length)
+        if payload is None:
+            return None
+        self.bytes_received += HEADER.size + length
+
+        previous = self.frame if base_id else None
+        self.frame = decode_delta(payload, previous, (h, w, 3), tile)
+        self.frame_id = frame_id
+        self.sock.sendall(ACK.pack(frame_id))
+        return self.frame
+
+    def close(self):
+        self.sock.close()
+
+
+def main():
+    """Simple viewer: python desktop_stream.py [host] [port]"""
+    import sys
+    import cv2
+
+    host = sys.argv[1] if len(sys.argv) > 1 else '127.0.0.1'
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 5900
+    client = DesktopStreamClient(host, port)
+
+    while True:
+        frame = client.receive()
+        if frame is None:
+            break
+        cv2.imshow("Remote Desktop", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    client.close()
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
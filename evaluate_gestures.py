@@ -0,0 +1,360 @@
+"""
+Gesture accuracy and latency evaluation
+
+Replays labeled landmark recordings through every detector and reports
+precision, recall, false triggers per minute, detection latency and
+per-frame compute cost. Runs headless, so threshold changes can be gated on
+it:
+
+    python evaluate_gestures.py recordings/*.npz --min-recall 0.9
+    python evaluate_gestures.py --synthetic 20 --fps 15 30 60 90
+
+A recording is an .npz file (see save_recording) holding:
+    timestamps_ms  (T,) capture time of each frame
+    landmarks      (T, 21, 2) pixel landmarks of the first hand, NaN if none
+    label_names    (N,) gesture names, e.g. 'swipe_left', 'push', 'pinch'
+    label_spans    (N, 2) [start, end) frame span of each labeled gesture
+"""
+import argparse
+import glob
+import sys
+import time
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from gesture_recognizer import GestureRecognizer
+from hand_backends import SyntheticBackend
+from hand_tracker import count_fingers, pinch_distance
+
+PINCH_THRESHOLD = 40  # pixels, matches HandTracker.is_pinching
+ONSET_WINDOW_MS = 200  # labels for pinch/finger onsets span this long
+MATCH_SLACK_MS = 100  # detections this soon after a label's span still count
+
+
+class Recording:
+    """Landmarks of one hand over time plus gesture labels"""
+
+    def __init__(self, timestamps_ms, landmarks, labels: List[Tuple[str, int, int]], name=""):
+        self.timestamps_ms = np.asarray(timestamps_ms, dtype=np.float64)
+        self.landmarks = np.asarray(landmarks, dtype=np.float32)
+        self.labels = labels
+        self.name = name
+
+    @property
+    def duration_ms(self) -> float:
+        if len(self.timestamps_ms) < 2:
+            return 0.0
+        return float(self.timestamps_ms[-1] - self.timestamps_ms[0])
+
+
+def save_recording(path, recording: Recording):
+    np.savez_compressed(
+        path,
+        timestamps_ms=recording.timestamps_ms,
+        landmarks=recording.landmarks,
+        label_names=np.array([name for name, _, _ in recording.labels], dtype=str),
+        label_spans=np.array([(start, end) for _, start, end in recording.labels],
+                             dtype=np.int64).reshape(-1, 2))
+
+
+def load_recording(path) -> Recording:
+    with np.load(path) as data:
+        labels = [(str(name), int(start), int(end))
+                  for name, (start, end) in zip(data['label_names'], data['label_spans'])]
+        return Recording(data['timestamps_ms'], data['landmarks'], labels, name=path)
+
+
+# --- Synthetic corpus -------------------------------------------------------
+
+FINGERS_PER_POSE = {'open': 5, 'point': 1, 'pinch': 0, 'fist': 0}
+
+
+def _circle_segments(center, radius, duration_ms, steps=8):
+    """Polyline approximation of a loop, clockwise on screen"""
+    angles = np.linspace(0, 2 * np.pi, steps + 1)
+    points = [(center[0] + radius * np.cos(a), center[1] + radius * np.sin(a)) for a in angles]
+    return [('point', duration_ms / steps, points[i], points[i + 1]) for i in range(steps)]
+
+
+# Each entry is a list of script segments and the motion label (if any) that
+# spans them. Pinch and finger count onsets are labeled from the poses.
+SCENARIO = [
+    ([('point', 600, (0.30, 0.50), (0.50, 0.45))], None),
+    ([('pinch', 600, (0.50, 0.45), (0.40, 0.40))], None),
+    ([('open', 400, (0.40, 0.40), (0.30, 0.50))], None),
+    ([('open', 250, (0.30, 0.50), (0.75, 0.50))], 'swipe_right'),
+    ([('open', 600, (0.75, 0.50), (0.75, 0.50))], None),
+    ([('open', 250, (0.75, 0.50), (0.30, 0.50))], 'swipe_left'),
+    ([('open', 600, (0.30, 0.50), (0.30, 0.50))], None),
+    ([('point', 600, (0.30, 0.50), (0.50, 0.25))], None),
+    ([('point', 250, (0.50, 0.25), (0.50, 0.80))], 'push'),
+    ([('point', 600, (0.50, 0.80), (0.50, 0.80))], None),
+    ([('point', 250, (0.50, 0.80), (0.50, 0.25))], 'pull'),
+    ([('point', 600, (0.50, 0.25), (0.60, 0.50))], None),
+    (_circle_segments((0.50, 0.50), 0.10, 280), 'circle_clockwise'),
+    ([('point', 600, (0.60, 0.50), (0.60, 0.50))], None),
+    # An open-hand swipe down also looks like a push; in the app the swipe
+    # detector runs first and its cooldown suppresses the push
+    ([('open', 600, (0.60, 0.50), (0.50, 0.25))], None),
+    ([('open', 250, (0.50, 0.25), (0.50, 0.80))], 'swipe_down'),
+    ([('open', 600, (0.50, 0.80), (0.50, 0.80))], None),
+    ([(None, 400, (0.0, 0.0), (0.0, 0.0))], None),
+]
+
+
+def synthetic_recording(fps=30, repeats=1, frame_shape=(480, 640)) -> Recording:
+    """Sample the scripted scenario at `fps` and label it"""
+    script = []
+    label_times = []  # (name, start_ms, end_ms)
+    t = 0.0
+    previous_pose = None
+    for _ in range(repeats):
+        for segments, label in SCENARIO:
+            block_start = t
+            for pose, duration, start, end in segments:
+                if pose != previous_pose and pose is not None:
+                    if pose == 'pinch':
+                        label_times.append(('pinch', t, t + ONSET_WINDOW_MS))
+                    if previous_pose is None or FINGERS_PER_POSE[pose] != FINGERS_PER_POSE[previous_pose]:
+                        label_times.append((f"fingers_{FINGERS_PER_POSE[pose]}", t, t + ONSET_WINDOW_MS))
+                previous_pose = pose
+                script.append((pose, duration, start, end))
+                t += duration
+            if label:
+                label_times.append((label, block_start, t))
+
+    backend = SyntheticBackend(script, loop=False)
+    h, w = frame_shape
+    timestamps = np.arange(0, t, 1000.0 / fps)
+    landmarks = np.full((len(timestamps), 21, 2), np.nan, dtype=np.float32)
+    for i, ts in enumerate(timestamps):
+        hands = backend.landmarks_at(ts)
+        if len(hands):
+            landmarks[i] = hands[0, :, :2] * (w, h)
+
+    def frame_at(ms):
+        return int(np.searchsorted(timestamps, ms))
+
+    labels = [(name, frame_at(start), frame_at(end)) for name, start, end in label_times]
+    return Recording(timestamps, landmarks, labels, name=f"synthetic@{fps:g}fps")
+
+
+# --- Detection ---------------------------------------------------------------
+
+def _run_recognizer(recording, detectors):
+    """
+    Feed one recording through a single GestureRecognizer
+
+    `detectors` is a list of (detector, detect function, gate) run in order
+    on every frame, skipping frames where the gate is False. They share the
+    recognizer, so a gesture's cooldown and consumed history affect the
+    detectors after it, as in the app.
+
+    Returns the (frame, name) detections and seconds spent per detector
+    """
+    recognizer = GestureRecognizer()
+    has_hand = ~np.isnan(recording.landmarks[:, 8, 0])
+    tips = np.nan_to_num(recording.landmarks[:, 8]).astype(np.int32)
+    detections = {detector: [] for detector, _, _ in detectors}
+    cost = {detector: 0.0 for detector, _, _ in detectors}
+
+    update_seconds = 0.0
+    for i, ts in enumerate(recording.timestamps_ms):
+        position = (int(tips[i][0]), int(tips[i][1])) if has_hand[i] else None
+        start = time.perf_counter()
+        recognizer.update(position, timestamp=ts / 1000)
+        update_seconds += time.perf_counter() - start
+        for detector, detect, gate in detectors:
+            if gate is not None and not gate[i]:
+                continue
+            start = time.perf_counter()
+            name = detect(recognizer)
+            cost[detector] += time.perf_counter() - start
+            if name:
+                detections[detector].append((i, name))
+
+    # Each detector is charged an equal share of the history updates
+    for detector in cost:
+        cost[detector] += update_seconds / len(cost)
+    return detections, cost
+
+
+def _onsets(values, valid):
+    """Frames where a per-frame state changes to a new value"""
+    values = np.where(valid, values, -1)
+    previous = np.concatenate(([-1], values[:-1]))
+    return np.flatnonzero(valid & (values != previous))
+
+
+def _detect_swipe(recognizer):
+    direction = recognizer.detect_swipe()
+    return direction and f"swipe_{direction}"
+
+
+def _detect_push(recognizer):
+    return recognizer.detect_push() and 'push'
+
+
+def _detect_pull(recognizer):
+    return recognizer.detect_pull() and 'pull'
+
+
+def _detect_circle(recognizer):
+    direction = recognizer.detect_circle()
+    return direction and f"circle_{direction}"
+
+
+def run_detectors(recording: Recording, shared=True) -> Tuple[Dict[str, List[Tuple[int, str]]], Dict[str, float]]:
+    """
+    Run every detector over a recording; returns detections and seconds per detector
+
+    With `shared`, the motion detectors run in the app's order on one
+    recognizer (circle last, though the app does not use it), so
+    interference between them is measured. Otherwise each detector gets its
+    own recognizer.
+    """
+    detections = {}
+    cost = {}
+
+    # Pinch and finger count are stateless, so evaluate all frames at once
+    has_hand = ~np.isnan(recording.landmarks[:, 0, 0])
+    start = time.perf_counter()
+    pinching = has_hand & (pinch_distance(recording.landmarks) < PINCH_THRESHOLD)
+    detections['pinch'] = [(i, 'pinch') for i in _onsets(pinching, pinching)]
+    cost['pinch'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fingers = np.where(has_hand, count_fingers(np.nan_to_num(recording.landmarks)), -1)
+    detections['fingers'] = [(i, f"fingers_{fingers[i]}") for i in _onsets(fingers, has_hand)]
+    cost['fingers'] = time.perf_counter() - start
+
+    # Swipes are only checked with an open hand, as in the app
+    motion = [
+        ('swipe', _detect_swipe, fingers == 5),
+        ('push', _detect_push, None),
+        ('pull', _detect_pull, None),
+        ('circle', _detect_circle, None),
+    ]
+    runs = [motion] if shared else [[detector] for detector in motion]
+    for detectors in runs:
+        run_detections, run_cost = _run_recognizer(recording, detectors)
+        detections.update(run_detections)
+        cost.update(run_cost)
+
+    return detections, cost
+
+
+def _detector_for(label):
+    return label.split('_')[0]
+
+
+class DetectorStats:
+    def __init__(self):
+        self.labels = 0
+        self.true_positives = 0
+        self.false_positives = 0
+        self.latencies_ms: List[float] = []
+        self.seconds = 0.0
+        self.frames = 0
+        self.total_minutes = 0.0
+
+
+def evaluate(recordings: List[Recording], shared=True) -> Dict[str, DetectorStats]:
+    """
+    Match detections to labels
+
+    A label is detected by the first detection with the same name inside its
+    span, or up to MATCH_SLACK_MS after it (a detector only sees the end of a
+    gesture on the next sample, which at low frame rates can fall outside
+    the span); every other detection counts as a false trigger.
+    """
+    stats = defaultdict(DetectorStats)
+
+    for recording in recordings:
+        detections, cost = run_detectors(recording, shared)
+
+        for detector, events in detections.items():
+            stats[detector].seconds += cost[detector]
+            stats[detector].frames += len(recording.timestamps_ms)
+            stats[detector].total_minutes += recording.duration_ms / 60000
+
+            matched = set()
+            for name, start, end in recording.labels:
+                if _detector_for(name) != detector:
+                    continue
+                stats[detector].labels += 1
+                latest_ms = recording.timestamps_ms[max(end - 1, start)] + MATCH_SLACK_MS
+                for index, (frame, detected) in enumerate(events):
+                    if (index not in matched and detected == name and start <= frame
+                            and recording.timestamps_ms[frame] <= latest_ms):
+                        matched.add(index)
+                        stats[detector].true_positives += 1
+                        stats[detector].latencies_ms.append(
+                            recording.timestamps_ms[frame] - recording.timestamps_ms[start])
+                        break
+            stats[detector].false_positives += len(events) - len(matched)
+
+    return stats
+
+
+def print_report(stats: Dict[str, DetectorStats]):
+    header = (f"{'detector':<9} {'labels':>6} {'TP':>5} {'FP':>5} {'prec':>6} {'recall':>6} "
+              f"{'FP/min':>7} {'lat ms':>7} {'p95 ms':>7} {'us/frame':>9}")
+    print(header)
+    print("-" * len(header))
+    for detector in sorted(stats):
+        s = stats[detector]
+        detected = s.true_positives + s.false_positives
+        precision = s.true_positives / detected if detected else 1.0
+        recall = s.true_positives / s.labels if s.labels else 1.0
+        fp_rate = s.false_positives / s.total_minutes if s.total_minutes else 0.0
+        latency = np.mean(s.latencies_ms) if s.latencies_ms else float('nan')
+        p95 = np.percentile(s.latencies_ms, 95) if s.latencies_ms else float('nan')
+        per_frame = s.seconds * 1e6 / s.frames if s.frames else 0.0
+        print(f"{detector:<9} {s.labels:>6} {s.true_positives:>5} {s.false_positives:>5} "
+              f"{precision:>6.2f} {recall:>6.2f} {fp_rate:>7.2f} {latency:>7.0f} {p95:>7.0f} "
+              f"{per_frame:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate gesture detectors on labeled recordings")
+    parser.add_argument('recordings', nargs='*', help=".npz landmark recordings (globs allowed)")
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="Add a synthetic recording with this many scenario repeats per --fps")
+    parser.add_argument('--fps', type=float, nargs='+', default=[30],
+                        help="Sampling rates for synthetic recordings")
+    parser.add_argument('--isolated', action='store_true',
+                        help="Give each motion detector its own recognizer instead of sharing one as the app does")
+    parser.add_argument('--min-precision', type=float, default=0.0)
+    parser.add_argument('--min-recall', type=float, default=0.0)
+    args = parser.parse_args()
+
+    recordings = [load_recording(path) for pattern in args.recordings
+                  for path in sorted(glob.glob(pattern))]
+    if args.synthetic:
+        recordings += [synthetic_recording(fps, args.synthetic) for fps in args.fps]
+    if not recordings:
+        parser.error("no recordings given (pass .npz files or --synthetic N)")
+
+    start = time.perf_counter()
+    stats = evaluate(recordings, shared=not args.isolated)
+    frames = sum(len(r.timestamps_ms) for r in recordings)
+    print(f"{len(recordings)} recordings, {frames} frames, "
+          f"evaluated in {time.perf_counter() - start:.2f} s\n")
+    print_report(stats)
+
+    # Non-zero exit status so threshold changes can be gated on the result
+    failed = []
+    for detector, s in stats.items():
+        detected = s.true_positives + s.false_positives
+        if s.labels and s.true_positives / s.labels < args.min_recall:
+            failed.append(f"{detector} recall")
+        if detected and s.true_positives / detected < args.min_precision:
+            failed.append(f"{detector} precision")
+    if failed:
+        print(f"\nBelow threshold: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
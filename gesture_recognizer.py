@@ -1,126 +1,201 @@
+import time
 import numpy as np
 from collections import deque
 from typing import Optional, Tuple
 
 class GestureRecognizer:
 
-    
-    def __init__(self, history_size = 10):
-        self.position_history = deque(maxlen=history_size)
+
+    def __init__(self, history_window=0.3, cooldown_time=0.5, min_duration=0.1):
+        # Samples are timestamped and evicted by age, so gestures behave the
+        # same whether the camera runs at 15 or 90 fps
+        self.position_history = deque()
+        self.timestamps = deque()
+        self.history_window = history_window  # Seconds of movement to keep
+        self.min_duration = min_duration  # Seconds of movement needed before detecting
         self.last_gesture = None
-        self.gesture_cooldown = 0
-        self.cooldown_frames = 15  # Prevent rapid re-triggering
-        
-    def update(self, position: Optional[Tuple[int, int]]):
+        self.cooldown_time = cooldown_time  # Prevent rapid re-triggering (seconds)
+        self.cooldown_until = 0.0
+        self.current_time = 0.0
+
+    def update(self, position: Optional[Tuple[int, int]], timestamp: Optional[float] = None):
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.current_time = timestamp
 
-        if position:
+        # Movement during the cooldown belongs to the gesture that triggered it
+        if position and self._cooldown_ready():
             self.position_history.append(position)
-        
-        # Decrease cooldown
-        if self.gesture_cooldown > 0:
-            self.gesture_cooldown -= 1
-    
-    def detect_swipe(self, direction='any', threshold=100) -> Optional[str]:
-
-        if len(self.position_history) < 5:
+            self.timestamps.append(timestamp)
+
+        # Evict samples older than the history window
+        oldest = timestamp - self.history_window
+        while self.timestamps and self.timestamps[0] < oldest:
+            self.timestamps.popleft()
+            self.position_history.popleft()
+
+    def _duration(self) -> float:
+        """Time spanned by the samples currently in history"""
+        if len(self.timestamps) < 2:
+            return 0.0
+        return self.timestamps[-1] - self.timestamps[0]
+
+    def _has_enough_history(self) -> bool:
+        return self._duration() >= self.min_duration
+
+    def _recent_span(self, measure, threshold):
+        """
+        Find the most recent sample the hand has moved `threshold` from
+
+        `measure(start, end)` gives the movement between two positions. Speed
+        is taken over this span rather than the whole window, so still
+        samples at the start of the window (whose number depends on the frame
+        rate) do not dilute it.
+
+        Returns:
+            (start position, seconds from it to the latest sample), or None
+        """
+        end = self.position_history[-1]
+        end_time = self.timestamps[-1]
+        for i in range(len(self.position_history) - 2, -1, -1):
+            start = self.position_history[i]
+            if measure(start, end) >= threshold:
+                # The movement began somewhere between this sample and the
+                # next; time it from the midpoint so the error is at most half
+                # a frame either way
+                began = (self.timestamps[i] + self.timestamps[i + 1]) / 2
+                return start, max(end_time - began, 1e-6)
+        return None
+
+    def _cooldown_ready(self) -> bool:
+        return self.current_time >= self.cooldown_until
+
+    def _start_cooldown(self):
+        self.cooldown_until = self.current_time + self.cooldown_time
+        # The movement that triggered the gesture is consumed
+        self.position_history.clear()
+        self.timestamps.clear()
+
+    def detect_swipe(self, direction='any', threshold=100, min_speed=400) -> Optional[str]:
+        """
+        Detect a directional swipe
+
+        Args:
+            direction: 'left', 'right', 'up', 'down' or 'any'
+            threshold: Minimum displacement in pixels within the history window
+            min_speed: Minimum average speed in pixels per second over that displacement
+
+        Returns:
+            Detected direction, or None
+        """
+        if not self._has_enough_history():
             return None
-        
-        # Get start and end positions
-        start = self.position_history[0]
+
+        # Check if movement is significant and fast enough
+        span = self._recent_span(
+            lambda a, b: np.sqrt((b[0] - a[0])**2 + (b[1] - a[1])**2), threshold)
+        if span is None:
+            return None
+        start, duration = span
         end = self.position_history[-1]
-        
+
         # Calculate displacement
         dx = end[0] - start[0]
         dy = end[1] - start[1]
-        
-        # Check if movement is significant enough
-        distance = np.sqrt(dx**2 + dy**2)
-        if distance < threshold:
+        if np.sqrt(dx**2 + dy**2) / duration < min_speed:
             return None
-        
+
         # Determine primary direction
         if abs(dx) > abs(dy):
             detected_direction = 'right' if dx > 0 else 'left'
         else:
             detected_direction = 'down' if dy > 0 else 'up'
-        
+
         # Check if it matches requested direction
         if direction == 'any' or direction == detected_direction:
-            if self.gesture_cooldown == 0:
-                self.gesture_cooldown = self.cooldown_frames
+            if self._cooldown_ready():
+                self._start_cooldown()
                 return detected_direction
-        
+
         return None
-    
-    def detect_push(self, threshold=150) -> bool:
 
-        if len(self.position_history) < 5:
+    def detect_push(self, threshold=150, min_speed=500) -> bool:
+
+        if not self._has_enough_history():
             return False
-        
+
         # Check if hand is moving down and spreading
         # in webcam view moving toward camera appears as downward movement
-        start = self.position_history[0]
-        end = self.position_history[-1]
-        
-        dy = end[1] - start[1]  # Positive = moving down (toward camera)
-        
-        if dy > threshold and self.gesture_cooldown == 0:
-            self.gesture_cooldown = self.cooldown_frames
+        # (positive dy = moving down, toward camera)
+        span = self._recent_span(lambda a, b: b[1] - a[1], threshold)
+        if span is None:
+            return False
+        start, duration = span
+        dy = self.position_history[-1][1] - start[1]
+
+        if dy / duration > min_speed and self._cooldown_ready():
+            self._start_cooldown()
             return True
-        
+
         return False
-    
-    def detect_pull(self, threshold=150) -> bool:
 
-        if len(self.position_history) < 5:
+    def detect_pull(self, threshold=150, min_speed=500) -> bool:
+
+        if not self._has_enough_history():
             return False
-        
-        start = self.position_history[0]
-        end = self.position_history[-1]
-        
-        dy = end[1] - start[1]  # Negative = moving up away from camera
-        
-        if dy < -threshold and self.gesture_cooldown == 0:
-            self.gesture_cooldown = self.cooldown_frames
+
+        # Negative dy = moving up, away from camera
+        span = self._recent_span(lambda a, b: a[1] - b[1], threshold)
+        if span is None:
+            return False
+        start, duration = span
+        dy = self.position_history[-1][1] - start[1]
+
+        if -dy / duration > min_speed and self._cooldown_ready():
+            self._start_cooldown()
             return True
-        
+
         return False
-    
+
     def detect_circle(self, threshold=200) -> Optional[str]:
 
-        if len(self.position_history) < 8:
+        # A loop needs a few more samples than a straight swipe
+        if len(self.position_history) < 4 or not self._has_enough_history():
             return None
-        
+
         # Calculate total path length
         total_distance = 0
         for i in range(1, len(self.position_history)):
             p1 = self.position_history[i-1]
             p2 = self.position_history[i]
             total_distance += np.sqrt((p2[0]-p1[0])**2 + (p2[1]-p1[1])**2)
-        
+
         # Check if path is long enough
         if total_distance < threshold:
             return None
-        
+
         # Check if start and end are close (closed loop)
         start = self.position_history[0]
         end = self.position_history[-1]
         closure_distance = np.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-        
+
         if closure_distance < 50:  # Points are close = closed loop
-            # Determine direction using cross product
+            # Determine direction using cross product (shoelace sum). Image
+            # y points down, so a negative sum is clockwise on screen
             cross_sum = 0
             for i in range(1, len(self.position_history)):
                 p1 = self.position_history[i-1]
                 p2 = self.position_history[i]
                 cross_sum += (p2[0] - p1[0]) * (p2[1] + p1[1])
-            
-            if self.gesture_cooldown == 0:
-                self.gesture_cooldown = self.cooldown_frames
-                return 'clockwise' if cross_sum > 0 else 'counterclockwise'
-        
+
+            if self._cooldown_ready():
+                self._start_cooldown()
+                return 'clockwise' if cross_sum < 0 else 'counterclockwise'
+
         return None
-    
+
     def reset(self):
         self.position_history.clear()
-        self.gesture_cooldown = 0
\ No newline at end of file
+        self.timestamps.clear()
+        self.cooldown_until = 0.0
@@ -0,0 +1,180 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+NUM_LANDMARKS = 21
+
+
+class HandBackend(ABC):
+    """
+    Interface for hand landmark detectors used by HandTracker
+
+    detect() returns a float32 array of shape (num_hands, 21, 3) with
+    normalized (x, y, z) coordinates, matching MediaPipe's convention
+    """
+
+    @abstractmethod
+    def detect(self, frame, timestamp_ms: int) -> np.ndarray:
+        """Detect hands in a BGR frame captured at `timestamp_ms`"""
+
+    def close(self):
+        """Release resources"""
+        pass
+
+
+def _no_hands() -> np.ndarray:
+    return np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+
+
+class MediaPipeBackend(HandBackend):
+    """MediaPipe Tasks HandLandmarker"""
+
+    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5):
+
+        # Imported here so other backends work without MediaPipe installed
+        import mediapipe as mp
+        from mediapipe.tasks import python
+        from mediapipe.tasks.python import vision
+        self._mp = mp
+
+        # Create hand landmarker options
+        base_options = python.BaseOptions(model_asset_path=self._download_model())
+        options = vision.HandLandmarkerOptions(
+            base_options=base_options,
+            running_mode=vision.RunningMode.VIDEO,
+            num_hands=max_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_tracking_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+        # Initialize the hand landmarker
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def _download_model(self):
+        """Download the hand landmark model if needed"""
+        import urllib.request
+        import os
+
+        model_path = "hand_landmarker.task"
+
+        if not os.path.exists(model_path):
+            print("Downloading hand landmark model (one-time setup)...")
+            url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+            try:
+                urllib.request.urlretrieve(url, model_path)
+                print("✓ Model downloaded successfully!")
+            except Exception as e:
+                print(f"Error downloading model: {e}")
+                print("Please download manually from:")
+                print(url)
+                raise
+
+        return model_path
+
+    def detect(self, frame, timestamp_ms: int) -> np.ndarray:
+        import cv2
+
+        # Convert BGR to RGB for MediaPipe
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        mp_image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb_frame)
+
+        results = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+        if not results.hand_landmarks:
+            return _no_hands()
+
+        return np.array([[(lm.x, lm.y, lm.z) for lm in hand]
+                         for hand in results.hand_landmarks], dtype=np.float32)
+
+    def close(self):
+        self.landmarker.close()
+
+
+def _pose(thumb, index, middle, ring, pinky):
+    """
+    Build a 21-landmark pose from four points per finger
+
+    Coordinates are hand-relative with the wrist at (0.01, 0.0);
+    SyntheticBackend moves the pose so its index tip follows the script
+    """
+    points = [(0.01, 0.0)] + list(thumb) + list(index) + list(middle) + list(ring) + list(pinky)
+    return np.array(points, dtype=np.float32)
+
+
+_THUMB_OUT = [(-0.04, -0.03), (-0.07, -0.06), (-0.09, -0.09), (-0.11, -0.11)]
+_THUMB_IN = [(-0.03, -0.03), (-0.04, -0.06), (-0.03, -0.09), (-0.01, -0.10)]
+_INDEX_UP = [(-0.03, -0.12), (-0.035, -0.17), (-0.04, -0.21), (-0.045, -0.24)]
+_INDEX_DOWN = [(-0.03, -0.12), (-0.035, -0.16), (-0.03, -0.13), (-0.025, -0.10)]
+_MIDDLE_UP = [(0.0, -0.13), (0.0, -0.19), (0.0, -0.23), (0.0, -0.26)]
+_MIDDLE_DOWN = [(0.0, -0.13), (0.0, -0.17), (0.0, -0.14), (0.0, -0.11)]
+_RING_UP = [(0.03, -0.12), (0.035, -0.17), (0.04, -0.20), (0.045, -0.23)]
+_RING_DOWN = [(0.03, -0.12), (0.03, -0.16), (0.03, -0.13), (0.03, -0.10)]
+_PINKY_UP = [(0.06, -0.10), (0.07, -0.14), (0.075, -0.17), (0.08, -0.19)]
+_PINKY_DOWN = [(0.06, -0.10), (0.06, -0.13), (0.06, -0.11), (0.06, -0.09)]
+
+# Thumb tip resting on the index tip
+_THUMB_PINCH = [(-0.04, -0.03), (-0.06, -0.07), (-0.05, -0.10), (-0.04, -0.135)]
+_INDEX_PINCH = [(-0.03, -0.12), (-0.04, -0.15), (-0.045, -0.15), (-0.04, -0.14)]
+
+POSES = {
+    'open': _pose(_THUMB_OUT, _INDEX_UP, _MIDDLE_UP, _RING_UP, _PINKY_UP),
+    'point': _pose(_THUMB_IN, _INDEX_UP, _MIDDLE_DOWN, _RING_DOWN, _PINKY_DOWN),
+    'pinch': _pose(_THUMB_PINCH, _INDEX_PINCH, _MIDDLE_DOWN, _RING_DOWN, _PINKY_DOWN),
+    'fist': _pose(_THUMB_IN, _INDEX_DOWN, _MIDDLE_DOWN, _RING_DOWN, _PINKY_DOWN),
+}
+
+# (pose, duration in ms, index tip start (x, y), index tip end (x, y)), normalized
+# coordinates; pose None means no hand in view
+DEFAULT_SCRIPT = [
+    ('point', 1000, (0.30, 0.40), (0.60, 0.50)),
+    ('pinch', 800, (0.60, 0.50), (0.45, 0.45)),
+    ('open', 500, (0.30, 0.50), (0.30, 0.50)),
+    ('open', 300, (0.30, 0.50), (0.75, 0.50)),
+    ('open', 700, (0.75, 0.50), (0.75, 0.50)),
+    (None, 500, (0.0, 0.0), (0.0, 0.0)),
+]
+
+
+class SyntheticBackend(HandBackend):
+    """
+    Deterministic backend that plays back scripted hand poses
+
+    The script is a list of (pose, duration_ms, start, end) segments. The
+    index finger tip moves linearly from start to end during each segment,
+    so results depend only on the timestamp, never on the frame rate.
+    """
+
+    def __init__(self, script: Optional[Sequence[Tuple]] = None, loop=True):
+
+        self.script: List[Tuple] = list(script or DEFAULT_SCRIPT)
+        self.loop = loop
+        self.duration_ms = sum(segment[1] for segment in self.script)
+        self.start_ms = None
+
+    def detect(self, frame, timestamp_ms: int) -> np.ndarray:
+        if self.start_ms is None:
+            self.start_ms = timestamp_ms
+        return self.landmarks_at(timestamp_ms - self.start_ms)
+
+    def landmarks_at(self, elapsed_ms: float) -> np.ndarray:
+        """Landmarks for a time offset into the script"""
+        if self.loop and self.duration_ms > 0:
+            elapsed_ms %= self.duration_ms
+
+        for pose, duration, start, end in self.script:
+            if elapsed_ms < duration:
+                break
+            elapsed_ms -= duration
+        else:
+            return _no_hands()
+
+        if pose is None:
+            return _no_hands()
+
+        t = elapsed_ms / duration if duration > 0 else 1.0
+        tip = np.array(start, dtype=np.float32) * (1 - t) + np.array(end, dtype=np.float32) * t
+
+        template = POSES[pose]
+        hand = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+        hand[0, :, :2] = template - template[8] + tip
+        return hand
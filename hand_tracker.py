@@ -1,107 +1,122 @@
+import time
+from functools import lru_cache
 import cv2
 import numpy as np
 from typing import Optional, Tuple, List
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
+from hand_backends import HandBackend, MediaPipeBackend
+
+# Skeleton topology as polyline chains: the five fingers from the wrist, then
+# the palm knuckles (23 connections in total)
+HAND_CHAINS = (
+    np.array([0, 1, 2, 3, 4]),       # Thumb
+    np.array([0, 5, 6, 7, 8]),       # Index finger
+    np.array([0, 9, 10, 11, 12]),    # Middle finger
+    np.array([0, 13, 14, 15, 16]),   # Ring finger
+    np.array([0, 17, 18, 19, 20]),   # Pinky
+    np.array([5, 9, 13, 17]),        # Palm
+)
+
+
+@lru_cache(maxsize=8)
+def _disk_offsets(radius):
+    """Pixel offsets (dy, dx) of a filled disk, as row vectors"""
+    r = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(r, r, indexing='ij')
+    mask = dy**2 + dx**2 <= radius**2
+    return dy[mask][None, :], dx[mask][None, :]
+
+
+def pinch_distance(landmarks) -> np.ndarray:
+    """
+    Distance between thumb tip (4) and index finger tip (8)
+    
+    Works on a single hand (21, 2) or a batch of hands (..., 21, 2)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    return np.linalg.norm(landmarks[..., 4, :2] - landmarks[..., 8, :2], axis=-1)
+
+
+def count_fingers(landmarks) -> np.ndarray:
+    """
+    Count extended fingers for a single hand (21, 2) or a batch (..., 21, 2)
+    """
+    landmarks = np.asarray(landmarks)
+    x = landmarks[..., 0]
+    y = landmarks[..., 1]
+    
+    # Determine handedness (left or right hand)
+    # For simplicity, we'll use a basic check
+    # If wrist is left of middle finger base, it's likely right hand
+    is_right_hand = x[..., 0] < x[..., 9]
+    
+    # Thumb - special case (horizontal check): tip outside of the thumb joint
+    thumb_up = np.where(is_right_hand, x[..., 4] > x[..., 3], x[..., 4] < x[..., 3])
+    
+    # Other fingers - check if tip is above the middle joint
+    finger_tips = [8, 12, 16, 20]  # Index, middle, ring, pinky tips
+    finger_joints = [6, 10, 14, 18]  # Corresponding joints
+    fingers_up = (y[..., finger_tips] < y[..., finger_joints]).sum(axis=-1)
+    
+    return fingers_up + thumb_up
+
 
 class HandTracker:
     
-    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5):
+    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5,
+                 backend: Optional[HandBackend] = None):
 
-        # Create hand landmarker options
-        base_options = python.BaseOptions(model_asset_path=self._download_model())
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
-            num_hands=max_hands,
-            min_hand_detection_confidence=min_detection_confidence,
-            min_hand_presence_confidence=min_tracking_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
-        
-        # Initialize the hand landmarker
-        self.landmarker = vision.HandLandmarker.create_from_options(options)
-        
-        self.results = None
+        # Default to MediaPipe; any HandBackend (e.g. SyntheticBackend) can be swapped in
+        if backend is None:
+            backend = MediaPipeBackend(max_hands, min_detection_confidence,
+                                       min_tracking_confidence)
+        self.backend = backend
+        
+        self.landmarks = np.zeros((0, 21, 3), dtype=np.float32)  # Normalized, per hand
         self.frame_shape = None
         self.timestamp_ms = 0
-        
-    def _download_model(self):
-        """Download the hand landmark model if needed"""
-        import urllib.request
-        import os
-        
-        model_path = "hand_landmarker.task"
-        
-        if not os.path.exists(model_path):
-            print("Downloading hand landmark model (one-time setup)...") 
-            url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
-            try:
-                urllib.request.urlretrieve(url, model_path)
-                print("✓ Model downloaded successfully!")
-            except Exception as e:
-                print(f"Error downloading model: {e}")
-                print("Please download manually from:")
-                print(url)
-                raise
-        
-        return model_path
     
-    def find_hands(self, frame, draw=True):
+    def find_hands(self, frame, draw=True, timestamp_ms=None):
 
         self.frame_shape = frame.shape
         
-        # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Create MediaPipe Image
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-        
-        # Process the frame
-        self.timestamp_ms += 33  # Approximate 30 fps
-        self.results = self.landmarker.detect_for_video(mp_image, self.timestamp_ms)
+        # Process the frame using the real capture time so tracking does not
+        # assume a fixed frame rate (VIDEO mode needs increasing timestamps)
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        self.timestamp_ms = max(int(timestamp_ms), self.timestamp_ms + 1)
+        self.landmarks = self.backend.detect(frame, self.timestamp_ms)
         
         # Draw hand landmarks if requested
-        if draw and self.results.hand_landmarks:
-            for hand_landmarks in self.results.hand_landmarks:
-                self._draw_landmarks(frame, hand_landmarks)
+        if draw:
+            self.draw_landmarks(frame)
         
         return frame
     
-    def _draw_landmarks(self, frame, hand_landmarks):
-        """Draw hand landmarks on frame"""
-        h, w, _ = frame.shape
-        
-        # Convert normalized landmarks to pixel coordinates
-        landmark_list = []
-        for landmark in hand_landmarks:
-            x = int(landmark.x * w)
-            y = int(landmark.y * h)
-            landmark_list.append((x, y))
-        
-        # Draw connections
-        connections = [
-            # Thumb
-            (0, 1), (1, 2), (2, 3), (3, 4),
-            # Index finger
-            (0, 5), (5, 6), (6, 7), (7, 8),
-            # Middle finger
-            (0, 9), (9, 10), (10, 11), (11, 12),
-            # Ring finger
-            (0, 13), (13, 14), (14, 15), (15, 16),
-            # Pinky
-            (0, 17), (17, 18), (18, 19), (19, 20),
-            # Palm
-            (5, 9), (9, 13), (13, 17)
-        ]
-        
-        for start, end in connections:
-            cv2.line(frame, landmark_list[start], landmark_list[end], (0, 255, 0), 2)
-        
-        # Draw landmarks
-        for x, y in landmark_list:
-            cv2.circle(frame, (x, y), 5, (255, 0, 255), -1)
+    def draw_landmarks(self, canvas, radius=5, thickness=2):
+        """
+        Draw the skeleton of every detected hand onto a canvas
+        
+        Landmarks are normalized, so the canvas can be the camera frame or a
+        downscaled inset of it; drawing on the inset is much cheaper.
+        """
+        if not len(self.landmarks):
+            return canvas
+        
+        h, w = canvas.shape[:2]
+        points = (self.landmarks[:, :, :2] * (w, h)).astype(np.int32)
+        
+        # One batched call for every finger chain of every hand
+        chains = [hand[chain] for hand in points for chain in HAND_CHAINS]
+        cv2.polylines(canvas, chains, False, (0, 255, 0), thickness)
+        
+        # Stamp the joint dots with a precomputed disk
+        dy, dx = _disk_offsets(radius)
+        ys = (points[:, :, 1].reshape(-1, 1) + dy).ravel()
+        xs = (points[:, :, 0].reshape(-1, 1) + dx).ravel()
+        inside = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+        canvas[ys[inside], xs[inside]] = (255, 0, 255)
+        
+        return canvas
     
     def get_finger_tip_position(self, hand_index=0) -> Optional[Tuple[int, int]]:
         """
@@ -113,22 +128,13 @@ class HandTracker:
         Returns:
             (x, y) position in pixels, or None if no hand detected
         """
-        if not self.results or not self.results.hand_landmarks:
-            return None
-        
-        if hand_index >= len(self.results.hand_landmarks):
+        landmarks = self.get_landmark_array(hand_index)
+        if landmarks is None:
             return None
         
         # Index finger tip is landmark 8
-        hand_landmarks = self.results.hand_landmarks[hand_index]
-        tip = hand_landmarks[8]
-        
-        # Convert normalized coordinates to pixel coordinates
-        h, w, _ = self.frame_shape
-        x = int(tip.x * w)
-        y = int(tip.y * h)
-        
-        return (x, y)
+        x, y = landmarks[8]
+        return (int(x), int(y))
     
     def get_all_landmarks(self, hand_index=0) -> Optional[List[Tuple[int, int]]]:
         """
@@ -137,22 +143,25 @@ class HandTracker:
         Returns:
             List of (x, y) positions for all landmarks, or None
         """
-        if not self.results or not self.results.hand_landmarks:
-            return None
-        
-        if hand_index >= len(self.results.hand_landmarks):
+        landmarks = self.get_landmark_array(hand_index)
+        if landmarks is None:
             return None
         
-        hand_landmarks = self.results.hand_landmarks[hand_index]
-        h, w, _ = self.frame_shape
+        return [(int(x), int(y)) for x, y in landmarks]
+    
+    def get_landmark_array(self, hand_index=0) -> Optional[np.ndarray]:
+        """
+        Get all 21 hand landmarks as an array
         
-        landmarks = []
-        for landmark in hand_landmarks:
-            x = int(landmark.x * w)
-            y = int(landmark.y * h)
-            landmarks.append((x, y))
+        Returns:
+            (21, 2) int32 array of pixel positions, or None
+        """
+        if hand_index >= len(self.landmarks) or self.frame_shape is None:
+            return None
         
-        return landmarks
+        # Convert normalized coordinates to pixel coordinates
+        h, w = self.frame_shape[:2]
+        return (self.landmarks[hand_index, :, :2] * (w, h)).astype(np.int32)
     
     def is_pinching(self, hand_index=0, threshold=40) -> bool:
         """
@@ -165,19 +174,11 @@ class HandTracker:
         Returns:
             True if pinching, False otherwise
         """
-        landmarks = self.get_all_landmarks(hand_index)
-        if not landmarks:
+        landmarks = self.get_landmark_array(hand_index)
+        if landmarks is None:
             return False
         
-        # Thumb tip is landmark 4, index finger tip is landmark 8
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        
-        # Calculate Euclidean distance
-        distance = np.sqrt((thumb_tip[0] - index_tip[0])**2 + 
-                          (thumb_tip[1] - index_tip[1])**2)
-        
-        return distance < threshold
+        return bool(pinch_distance(landmarks) < threshold)
     
     def count_fingers_up(self, hand_index=0) -> int:
         """
@@ -186,37 +187,12 @@ class HandTracker:
         Returns:
             Number of fingers up (0-5)
         """
-        landmarks = self.get_all_landmarks(hand_index)
-        if not landmarks:
+        landmarks = self.get_landmark_array(hand_index)
+        if landmarks is None:
             return 0
         
-        fingers_up = 0
-        
-        # Determine handedness (left or right hand)
-        # For simplicity, we'll use a basic check
-        # If wrist is left of middle finger base, it's likely right hand
-        wrist_x = landmarks[0][0]
-        middle_base_x = landmarks[9][0]
-        is_right_hand = wrist_x < middle_base_x
-        
-        # Thumb - special case (horizontal check)
-        if is_right_hand:
-            if landmarks[4][0] > landmarks[3][0]:  # Thumb tip right of thumb joint
-                fingers_up += 1
-        else:
-            if landmarks[4][0] < landmarks[3][0]:  # Thumb tip left of thumb joint
-                fingers_up += 1
-        
-        # Other fingers - check if tip is above the middle joint
-        finger_tips = [8, 12, 16, 20]  # Index, middle, ring, pinky tips
-        finger_joints = [6, 10, 14, 18]  # Corresponding joints
-        
-        for tip, joint in zip(finger_tips, finger_joints):
-            if landmarks[tip][1] < landmarks[joint][1]:  # Tip is above joint
-                fingers_up += 1
-        
-        return fingers_up
+        return int(count_fingers(landmarks))
     
     def release(self):
         """Release resources"""
-        self.landmarker.close()
\ No newline at end of file
+        self.backend.close()
\ No newline at end of file
@@ -1,22 +1,42 @@
+import argparse
+import time
 import cv2
 import numpy as np
 from hand_tracker import HandTracker
 from gesture_recognizer import GestureRecognizer
 from virtual_window import VirtualDesktop
+from session_recorder import SessionRecorder, SessionReader
+from desktop_stream import DesktopStreamServer
 
 class GestureControlApp:
     """Main application coordinating all components"""
     
-    def __init__(self, camera_id= 2):
+    def __init__(self, camera_id= 2, record_seconds=None, replay_path=None,
+                 stream_host='127.0.0.1', stream_port=None):
 
         self.hand_tracker = HandTracker(max_hands=1)
-        self.gesture_recognizer = GestureRecognizer(history_size=10)
+        self.gesture_recognizer = GestureRecognizer(history_window=0.3)
         self.virtual_desktop = VirtualDesktop(width=1280, height=720)
         
-        # Initialize webcam
-        self.cap = cv2.VideoCapture(camera_id)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        # Initialize webcam, or play back a recorded session instead
+        self.replaying = replay_path is not None
+        if self.replaying:
+            self.cap = SessionReader(replay_path)
+        else:
+            self.cap = cv2.VideoCapture(camera_id)
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        
+        # Keep the last few seconds of raw frames for reproducing issues
+        self.recorder = None
+        if record_seconds and not self.replaying:
+            self.recorder = SessionRecorder(seconds=record_seconds)
+        
+        # Mirror the rendered desktop to viewers on other screens
+        self.stream_server = None
+        if stream_port is not None:
+            self.stream_server = DesktopStreamServer(stream_host, stream_port)
+            self.stream_server.start()
         
         # State
         self.running = True
@@ -41,32 +61,59 @@ class GestureControlApp:
         print("\nKeyboard:")
         print("  - 'c' : Toggle camera view")
         print("  - 'r' : Reset window positions")
+        if self.recorder:
+            print("  - 'd' : Dump recorded session frames")
         print("  - 'q' : Quit")
         print("="*60 + "\n")
         
         cv2.namedWindow("Virtual Desktop", cv2.WINDOW_NORMAL)
         cv2.resizeWindow("Virtual Desktop", 1280, 720)
         
-        import time
+        try:
+            self._loop()
+        except Exception:
+            # Keep the frames that led up to the failure
+            if self.recorder:
+                path = self.recorder.dump(background=False)
+                print(f"Session frames saved to {path}")
+            raise
+        
+        self.cleanup()
+    
+    def _loop(self):
+        """Process frames until quit"""
         last_time = time.time()
         
         while self.running:
             ret, frame = self.cap.read()
             if not ret:
-                print("Failed to grab frame from camera")
+                if self.replaying:
+                    print("End of recorded session")
+                else:
+                    print("Failed to grab frame from camera")
                 break
             
+            # All timing below uses the capture time, not frame counts
+            now = time.monotonic()
+            capture_ms = self.cap.timestamp_ms if self.replaying else now * 1000
+            
+            # Record the raw frame (one copy into the ring file)
+            if self.recorder:
+                self.recorder.write(frame, capture_ms)
+            
             # Mirror the frame for natural interaction
             frame = cv2.flip(frame, 1)
             
             # Process hand tracking
-            frame = self.hand_tracker.find_hands(frame, draw=True)
+            # (landmarks are drawn later, onto the small camera inset)
+            frame = self.hand_tracker.find_hands(frame, draw=False,
+                                                 timestamp_ms=int(capture_ms))
             
             # Get finger tip position
             finger_pos = self.hand_tracker.get_finger_tip_position()
             
             # Update gesture recognizer
-            self.gesture_recognizer.update(finger_pos)
+            self.gesture_recognizer.update(finger_pos, timestamp=capture_ms / 1000)
             
             # Map webcam coordinates to desktop coordinates
             if finger_pos:
@@ -93,17 +140,17 @@ class GestureControlApp:
             if fingers_up == 5:  # Open hand for swipe gestures
                 swipe_direction = self.gesture_recognizer.detect_swipe()
                 if swipe_direction:
-                    self.virtual_desktop.handle_swipe(swipe_direction)
+                    self.virtual_desktop.handle_swipe(swipe_direction, now)
             
             # Push/Pull gestures
             if self.gesture_recognizer.detect_push():
-                self.virtual_desktop.handle_push()
+                self.virtual_desktop.handle_push(now)
             
             if self.gesture_recognizer.detect_pull():
-                self.virtual_desktop.handle_pull()
+                self.virtual_desktop.handle_pull(now)
             
             # Render virtual desktop
-            desktop_frame = self.virtual_desktop.render()
+            desktop_frame = self.virtual_desktop.render(now)
             
             # Draw cursor on desktop
             if self.cursor_position:
@@ -118,6 +165,7 @@ class GestureControlApp:
             if self.show_camera:
                 # Resize camera feed to fit in corner
                 small_frame = cv2.resize(frame, (320, 240))
+                self.hand_tracker.draw_landmarks(small_frame, radius=3, thickness=1)
                 desktop_frame[10:250, 10:330] = small_frame
                 cv2.rectangle(desktop_frame, (10, 10), (330, 250), (0, 255, 0), 2)
             
@@ -133,6 +181,10 @@ class GestureControlApp:
             cv2.putText(desktop_frame, f"FPS: {self.fps}", (10, desktop_frame.shape[0] - 10),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
             
+            # Send to remote viewers
+            if self.stream_server:
+                self.stream_server.publish(desktop_frame)
+            
             # Display
             cv2.imshow("Virtual Desktop", desktop_frame)
             
@@ -145,8 +197,9 @@ class GestureControlApp:
             elif key == ord('r'):
                 self.virtual_desktop._create_demo_windows()
                 self.virtual_desktop.set_status("Windows reset to default positions")
-        
-        self.cleanup()
+            elif key == ord('d') and self.recorder:
+                path = self.recorder.dump()
+                self.virtual_desktop.set_status(f"Saving session frames to {path}")
     
     def _draw_info_overlay(self, frame, fingers_up, is_pinching):
         """Draw information overlay"""
@@ -182,6 +235,10 @@ class GestureControlApp:
         """Release resources"""
         print("\nCleaning up...")
         self.cap.release()
+        if self.recorder:
+            self.recorder.close()
+        if self.stream_server:
+            self.stream_server.stop()
         self.hand_tracker.release()
         cv2.destroyAllWindows()
         print("Application closed successfully!")
@@ -189,8 +246,14 @@ class GestureControlApp:
 
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(description="Gesture-controlled virtual desktop")
+    parser.add_argument('--record', type=float, default=None, metavar='SECONDS',
+                        help="Keep the last SECONDS of camera frames in session.frames.npy")
+    parser.add_argument('--replay', help="Play back a recorded session instead of the camera")
+    args = parser.parse_args()
+
     try:
-        app = GestureControlApp(camera_id=0)
+        app = GestureControlApp(camera_id=0, record_seconds=args.record, replay_path=args.replay)
         app.run()
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
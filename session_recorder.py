@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+import numpy as np
+from typing import Optional
+
+# Each ring slot is described by its sequence number (-1 = empty) and the
+# capture time in milliseconds
+INDEX_DTYPE = np.dtype([('seq', '<i8'), ('timestamp_ms', '<f8')])
+
+
+def _index_path(path):
+    return os.path.splitext(path)[0] + ".index.npy"
+
+
+class SessionRecorder:
+    """
+    Records raw camera frames into a fixed-size memory-mapped ring file
+
+    The ring is sized to hold `seconds` of capture. Unless `fps` is given,
+    the capture rate is measured over the first `warmup_frames` frames and
+    the ring gets `headroom` times that many slots, so the rate may rise
+    somewhat without the ring covering less than `seconds`. Dumps keep only
+    the last `seconds` by timestamp.
+    """
+
+    def __init__(self, path="session.frames.npy", seconds=10, fps=None,
+                 headroom=1.5, warmup_frames=15):
+
+        self.path = path
+        self.seconds = seconds
+        self.fps = fps
+        self.headroom = headroom
+        self.warmup_frames = max(2, warmup_frames)
+        self.capacity = None
+        self.frames = None  # Allocated once the frame shape and rate are known
+        self.index = None
+        self.pending = []  # (frame, timestamp_ms) captured while measuring the rate
+        self.seq = 0
+        self.dump_thread: Optional[threading.Thread] = None
+        self.dump_lock = threading.Lock()
+        self.dump_state: Optional[dict] = None  # Output of the running dump
+
+    def _measured_fps(self) -> float:
+        if len(self.pending) < 2:
+            return 30.0  # Nothing to measure yet
+        elapsed_ms = self.pending[-1][1] - self.pending[0][1]
+        return (len(self.pending) - 1) * 1000 / elapsed_ms if elapsed_ms > 0 else 30.0
+
+    def _allocate(self, frame):
+        """Preallocate the ring and index files for frames shaped like `frame`"""
+        if self.fps is not None:
+            self.capacity = max(1, int(np.ceil(self.seconds * self.fps)))
+        else:
+            self.capacity = max(1, int(np.ceil(self.seconds * self._measured_fps() * self.headroom)))
+
+        self.frames = np.lib.format.open_memmap(
+            self.path, mode='w+', dtype=frame.dtype,
+            shape=(self.capacity,) + frame.shape)
+        self.index = np.lib.format.open_memmap(
+            _index_path(self.path), mode='w+', dtype=INDEX_DTYPE,
+            shape=(self.capacity,))
+        self.index['seq'] = -1
+
+        # Move the frames captured while measuring into the ring
+        pending, self.pending = self.pending, []
+        for pending_frame, timestamp_ms in pending:
+            self._store(pending_frame, timestamp_ms)
+
+    def write(self, frame, timestamp_ms=None):
+        """Copy one frame into the ring, overwriting the oldest slot"""
+        if timestamp_ms is None:
+            timestamp_ms = time.monotonic() * 1000
+        if self.frames is None:
+            if self.fps is None:
+                self.pending.append((frame.copy(), timestamp_ms))
+                if len(self.pending) >= self.warmup_frames:
+                    self._allocate(frame)
+                return
+            self._allocate(frame)
+        self._store(frame, timestamp_ms)
+
+    def _store(self, frame, timestamp_ms):
+        slot = self.seq % self.capacity
+        with self.dump_lock:
+            # A running dump still needs the frame about to be overwritten
+            if self.dump_state is not None:
+                self._copy_slot(self.seq - self.capacity)
+        # Invalidate the slot first so a concurrent reader never pairs the
+        # new pixels with the old index entry
+        self.index['seq'][slot] = -1
+        self.frames[slot] = frame
+        self.index[slot] = (self.seq, timestamp_ms)
+        self.seq += 1
+
+    def dump(self, path=None, background=True):
+        """
+        Save the last `seconds` of the ring to a separate file
+
+        The background copy runs newest first. Before the capture loop
+        overwrites a slot the dump has not reached yet, write() copies that
+        frame into the dump itself, so no frames are lost; a write during a
+        dump costs at most one extra frame copy.
+
+        Args:
+            path: Output path (defaults to a timestamped name next to the ring)
+            background: Copy in a worker thread so capture does not pause
+
+        Returns:
+            Output path, or None if nothing has been recorded yet
+        """
+        if self.frames is None:
+            if not self.pending:
+                return None
+            self._allocate(self.pending[-1][0])
+        if path is None:
+            stem = os.path.splitext(self.path)[0].replace(".frames", "")
+            path = f"{stem}_{time.strftime('%Y%m%d_%H%M%S')}.frames.npy"
+        if self.dump_thread is not None:
+            self.dump_thread.join()  # One dump at a time
+
+        # Snapshot which frames exist right now; newer ones are not included
+        end_seq = self.seq
+        start_seq = max(0, end_seq - self.capacity)
+        out_frames = np.lib.format.open_memmap(
+            path, mode='w+', dtype=self.frames.dtype,
+            shape=(end_seq - start_seq,) + self.frames.shape[1:])
+        out_index = np.lib.format.open_memmap(
+            _index_path(path), mode='w+', dtype=INDEX_DTYPE,
+            shape=(end_seq - start_seq,))
+        out_index['seq'] = -1
+
+        with self.dump_lock:
+            self.dump_state = {
+                'frames': out_frames,
+                'index': out_index,
+                'start_seq': start_seq,
+                'copied': np.zeros(end_seq - start_seq, dtype=bool),
+                'oldest_ms': self.index['timestamp_ms'][(end_seq - 1) % self.capacity] - self.seconds * 1000,
+            }
+
+        if background:
+            self.dump_thread = threading.Thread(
+                target=self._copy_ring, args=(start_seq, end_seq), daemon=False)
+            self.dump_thread.start()
+        else:
+            self._copy_ring(start_seq, end_seq)
+        return path
+
+    def _copy_slot(self, seq):
+        """Copy frame `seq` into the running dump if it still needs it (dump_lock held)"""
+        state = self.dump_state
+        i = seq - state['start_seq']
+        if i < 0 or i >= len(state['copied']) or state['copied'][i]:
+            return
+        state['copied'][i] = True
+
+        slot = seq % self.capacity
+        entry = self.index[slot].copy()
+        if entry['timestamp_ms'] < state['oldest_ms']:
+            return  # Older than the recording window
+        state['frames'][i] = self.frames[slot]
+        state['index'][i] = entry
+
+    def _copy_ring(self, start_seq, end_seq):
+        """Copy frames [start_seq, end_seq) into the dump, newest first"""
+        for seq in range(end_seq - 1, start_seq - 1, -1):
+            with self.dump_lock:
+                self._copy_slot(seq)
+
+        with self.dump_lock:
+            state, self.dump_state = self.dump_state, None
+        state['frames'].flush()
+        state['index'].flush()
+
+    def close(self):
+        """Wait for pending dumps and flush the ring to disk"""
+        if self.dump_thread is not None:
+            self.dump_thread.join()
+        if self.frames is not None:
+            self.frames.flush()
+            self.index.flush()
+
+
+class SessionReader:
+    """Plays back a recorded ring or dump like a cv2.VideoCapture"""
+
+    def __init__(self, path="session.frames.npy", loop=False):
+
+        self.frames = np.load(path, mmap_mode='r')
+        index = np.load(_index_path(path), mmap_mode='r')
+
+        # Play valid slots in recording order
+        valid = np.flatnonzero(index['seq'] >= 0)
+        self.order = valid[np.argsort(index['seq'][valid])]
+        self.timestamps_ms = np.asarray(index['timestamp_ms'][self.order])
+        self.loop = loop
+        self.position = 0
+        self.timestamp_ms = None
+
+    def isOpened(self) -> bool:
+        return len(self.order) > 0
+
+    def read(self):
+        """Return (ret, frame) for the next recorded frame"""
+        if self.position >= len(self.order):
+            if not self.loop or not len(self.order):
+                return False, None
+            self.position = 0
+
+        self.timestamp_ms = float(self.timestamps_ms[self.position])
+        frame = np.array(self.frames[self.order[self.position]])
+        self.position += 1
+        return True, frame
+
+    def set(self, prop_id, value):
+        """Capture properties are fixed by the recording"""
+        return False
+
+    def __len__(self):
+        return len(self.order)
+
+    def release(self):
+        self.frames = None
@@ -0,0 +1,96 @@
+import threading
+import time
+import numpy as np
+import pytest
+from desktop_stream import DesktopStreamClient, DesktopStreamServer, decode_delta, encode_delta
+
+
+def _frames(count, shape=(90, 100, 3)):
+    """A moving square on a static gradient, so only some tiles change"""
+    base = np.zeros(shape, dtype=np.uint8)
+    base[..., 0] = np.arange(shape[1], dtype=np.uint8)
+    for i in range(count):
+        frame = base.copy()
+        frame[10:30, 5 + i % 60:25 + i % 60] = (255, i % 256, 0)
+        yield frame
+
+
+@pytest.mark.parametrize('shape', [(64, 64, 3), (90, 100, 3)])
+def test_round_trip(shape):
+    previous = None
+    decoded = None
+    for frame in _frames(5, shape):
+        payload = encode_delta(frame, previous)
+        decoded = decode_delta(payload, decoded, shape)
+        assert np.array_equal(decoded, frame)
+        previous = frame
+
+
+def test_unchanged_frame_is_small():
+    frame = next(_frames(1))
+    keyframe = encode_delta(frame, None)
+    unchanged = encode_delta(frame, frame)
+    assert len(unchanged) < len(keyframe)
+    assert np.array_equal(decode_delta(unchanged, frame, frame.shape), frame)
+
+
+def _receive_all(client, received, delay):
+    while True:
+        frame = client.receive()
+        if frame is None:
+            break
+        received.append((client.frame_id, frame.copy()))
+        time.sleep(delay)
+
+
+def test_loopback_fast_and_slow_clients():
+    server = DesktopStreamServer('127.0.0.1', 0)
+    server.start()
+    host, port = server.address
+
+    clients = [DesktopStreamClient(host, port) for _ in range(2)]
+    received = [[], []]
+    threads = [
+        threading.Thread(target=_receive_all, args=(client, frames, delay), daemon=True)
+        for client, frames, delay in zip(clients, received, (0.0, 0.05))
+    ]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + 2.0
+    while len(server.clients) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(server.clients) == 2
+
+    published = {}
+    for frame in _frames(60):
+        server.publish(frame)
+        published[server.frame_id] = frame
+        time.sleep(0.005)
+
+    # Let both clients catch up with the last frame
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline and any(
+            not frames or frames[-1][0] != server.frame_id for frames in received):
+        time.sleep(0.01)
+
+    # Server-side stats are keyed by each client's local address
+    skipped = {c.address: c.frames_skipped for c in server.clients}
+    slow_skipped = skipped[clients[1].sock.getsockname()]
+    stats = server.stats()
+    server.stop()
+    for thread in threads:
+        thread.join(timeout=2.0)
+    for client in clients:
+        client.close()
+
+    for frames in received:
+        assert frames
+        for frame_id, frame in frames:
+            assert np.array_equal(frame, published[frame_id])
+
+    # The slow client only gets the newest frame after each acknowledgement
+    assert slow_skipped > 0
+    assert len(received[1]) < len(received[0])
+    assert stats['bytes_per_frame'] > 0
+    assert stats['encode_ms'] > 0
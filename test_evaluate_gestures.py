@@ -0,0 +1,27 @@
+import pytest
+from evaluate_gestures import evaluate, synthetic_recording
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return [synthetic_recording(fps, repeats=2) for fps in (15, 30, 60, 90)]
+
+
+def test_synthetic_corpus_passes_gate(corpus):
+    # The documented synthetic run must be usable as a gate
+    for detector, stats in evaluate(corpus).items():
+        assert stats.true_positives == stats.labels, detector
+        assert stats.false_positives == 0, detector
+
+
+def test_shared_recognizer_suppresses_cross_triggers(corpus):
+    # An open-hand swipe down also looks like a push; only the shared
+    # recognizer (as in the app) lets the swipe's cooldown suppress it
+    assert evaluate(corpus, shared=True)['push'].false_positives == 0
+    assert evaluate(corpus, shared=False)['push'].false_positives > 0
+
+
+def test_false_trigger_rate_uses_recording_length(corpus):
+    stats = evaluate(corpus)
+    expected = sum(r.duration_ms for r in corpus) / 60000
+    assert stats['swipe'].total_minutes == pytest.approx(expected)
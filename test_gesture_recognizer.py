@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from gesture_recognizer import GestureRecognizer
+
+RATES = [15, 30, 60, 90]
+
+
+def _track(t):
+    """
+    Index tip (x, y) at time t seconds: a right swipe, a push and a pull,
+    each 400 px over 0.4 s, separated by holds
+    """
+    def ramp(start, duration, distance):
+        return min(max((t - start) / duration, 0.0), 1.0) * distance
+
+    x = 100 + ramp(0.5, 0.4, 400)
+    y = 100 + ramp(1.5, 0.4, 300) - ramp(2.5, 0.4, 300)
+    return int(x), int(y)
+
+
+def _replay(fps, track, duration, detect):
+    """Feed a timestamped track at `fps` and collect (time, gesture) detections"""
+    recognizer = GestureRecognizer()
+    detections = []
+    for i in range(int(duration * fps) + 1):
+        t = i / fps
+        recognizer.update(track(t), timestamp=t)
+        gesture = detect(recognizer)
+        if gesture:
+            detections.append((t, gesture))
+    return detections
+
+
+def _detect_all(recognizer):
+    swipe = recognizer.detect_swipe(direction='right')
+    if swipe:
+        return f"swipe_{swipe}"
+    if recognizer.detect_push():
+        return 'push'
+    if recognizer.detect_pull():
+        return 'pull'
+    return None
+
+
+@pytest.mark.parametrize('fps', RATES)
+def test_same_detections_at_every_rate(fps):
+    detections = _replay(fps, _track, 3.5, _detect_all)
+
+    assert [gesture for _, gesture in detections] == ['swipe_right', 'push', 'pull']
+    # Each gesture fires within one frame of the 30 fps reference time
+    reference = _replay(30, _track, 3.5, _detect_all)
+    for (t, _), (ref_t, _) in zip(detections, reference):
+        assert abs(t - ref_t) <= max(1 / fps, 1 / 30) + 1e-9
+
+
+@pytest.mark.parametrize('fps', RATES)
+def test_cooldown_is_measured_in_seconds(fps):
+    # Two right swipes 0.35 s apart: the second starts inside the 0.5 s
+    # cooldown of the first and must be ignored at every rate
+    def track(t):
+        x = 100 + min(max((t - 0.5) / 0.2, 0), 1) * 200 + min(max((t - 0.85) / 0.2, 0), 1) * 200
+        return int(x), 240
+
+    detections = _replay(fps, track, 2.0, lambda r: r.detect_swipe())
+    assert [gesture for _, gesture in detections] == ['right']
+
+
+@pytest.mark.parametrize('fps', RATES)
+def test_swipe_after_cooldown_is_detected(fps):
+    def track(t):
+        x = 100 + min(max((t - 0.5) / 0.2, 0), 1) * 200 - min(max((t - 1.3) / 0.2, 0), 1) * 200
+        return int(x), 240
+
+    detections = _replay(fps, track, 2.0, lambda r: r.detect_swipe())
+    assert [gesture for _, gesture in detections] == ['right', 'left']
+
+
+@pytest.mark.parametrize('distance, expected', [(105, ['right']), (110, ['right']), (95, [])])
+def test_near_threshold_swipe_is_rate_independent(distance, expected):
+    # A move just above/below the 100 px threshold, fast enough for
+    # min_speed, gives the same answer at every rate
+    def track(t):
+        return int(100 + min(max((t - 0.5) / 0.2, 0), 1) * distance), 240
+
+    for fps in RATES:
+        detections = _replay(fps, track, 1.5, lambda r: r.detect_swipe())
+        assert [gesture for _, gesture in detections] == expected, fps
+
+
+def test_slow_drift_is_not_a_swipe():
+    # 150 px spread over 1.5 s stays below min_speed at every rate
+    def track(t):
+        return int(100 + t * 100), 240
+
+    for fps in RATES:
+        assert _replay(fps, track, 1.5, lambda r: r.detect_swipe()) == [], fps
+
+
+def test_history_evicts_by_age():
+    recognizer = GestureRecognizer(history_window=0.3)
+    for i in range(100):
+        recognizer.update((i, 0), timestamp=i / 90)
+    assert recognizer.timestamps[-1] - recognizer.timestamps[0] == pytest.approx(0.3)
+    assert recognizer.timestamps[0] >= recognizer.timestamps[-1] - 0.3 - 1e-9
+    assert len(recognizer.position_history) == len(recognizer.timestamps)
+
+
+@pytest.mark.parametrize('fps', RATES)
+@pytest.mark.parametrize('clockwise', [True, False])
+def test_circle_direction_in_screen_coordinates(fps, clockwise):
+    # Image y points down, so increasing angle is clockwise on screen
+    sign = 1 if clockwise else -1
+
+    def track(t):
+        angle = sign * 2 * np.pi * min(max((t - 0.5) / 0.28, 0), 1)
+        return int(320 + 60 * np.cos(angle)), int(240 + 60 * np.sin(angle))
+
+    detections = _replay(fps, track, 1.5, lambda r: r.detect_circle())
+    assert [gesture for _, gesture in detections] == ['clockwise' if clockwise else 'counterclockwise']
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from benchmark import run_benchmark
+from hand_backends import DEFAULT_SCRIPT, HandBackend, SyntheticBackend
+from hand_tracker import HandTracker
+
+
+def _segment_times(script):
+    """(pose, start_ms, end_ms, tip start, tip end) for each script segment"""
+    t = 0
+    for pose, duration, start, end in script:
+        yield pose, t, t + duration, start, end
+        t += duration
+
+
+def _drive(script=None, fps=30):
+    """Run a tracker on blank 640x480 frames and yield (elapsed_ms, tracker)"""
+    tracker = HandTracker(backend=SyntheticBackend(script, loop=False))
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    total_ms = sum(segment[1] for segment in script or DEFAULT_SCRIPT)
+    for i in range(int(total_ms * fps / 1000)):
+        timestamp_ms = 1000 + int(i * 1000 / fps)
+        tracker.find_hands(frame, draw=False, timestamp_ms=timestamp_ms)
+        yield timestamp_ms - 1000, tracker
+    tracker.release()
+
+
+def _samples(pose):
+    """Tracker state for frames well inside every segment with the given pose"""
+    segments = [s for s in _segment_times(DEFAULT_SCRIPT) if s[0] == pose]
+    samples = []
+    for elapsed_ms, tracker in _drive():
+        for _, start_ms, end_ms, start, end in segments:
+            if start_ms + 50 <= elapsed_ms <= end_ms - 50:
+                t = (elapsed_ms - start_ms) / (end_ms - start_ms)
+                expected = np.array(start) * (1 - t) + np.array(end) * t
+                samples.append({
+                    'fingers': tracker.count_fingers_up(),
+                    'pinching': tracker.is_pinching(),
+                    'tip': tracker.get_finger_tip_position(),
+                    'expected_tip': expected * (640, 480),
+                })
+    assert samples
+    return samples
+
+
+def test_point_has_one_finger_up():
+    assert all(s['fingers'] == 1 for s in _samples('point'))
+
+
+def test_open_has_five_fingers_up():
+    assert all(s['fingers'] == 5 for s in _samples('open'))
+
+
+def test_pinch_is_detected():
+    samples = _samples('pinch')
+    assert all(s['pinching'] for s in samples)
+    assert not any(s['pinching'] for s in _samples('open'))
+
+
+@pytest.mark.parametrize('pose', ['point', 'pinch', 'open'])
+def test_finger_tip_follows_script(pose):
+    for s in _samples(pose):
+        assert s['tip'] is not None
+        assert np.abs(np.array(s['tip']) - s['expected_tip']).max() <= 2
+
+
+def test_empty_segment_has_no_hand():
+    for s in _samples(None):
+        assert s['tip'] is None
+        assert s['fingers'] == 0
+        assert not s['pinching']
+
+
+def test_backend_without_detect_fails_at_construction():
+    class Incomplete(HandBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_benchmark_pinch_drag_on_title_bar():
+    # A pinch that lands on a window title bar starts a drag
+    script = [('pinch', 600, (300 / 640, 110 / 480), (250 / 640, 150 / 480))]
+    results = run_benchmark(SyntheticBackend(script), frames=30)
+    assert results['render'] > 0
@@ -0,0 +1,55 @@
+import numpy as np
+from session_recorder import SessionReader, SessionRecorder
+
+
+def _frame(value):
+    return np.full((4, 6, 3), value % 256, dtype=np.uint8)
+
+
+def test_ring_is_sized_from_measured_rate(tmp_path):
+    recorder = SessionRecorder(str(tmp_path / "ring.frames.npy"), seconds=2, warmup_frames=10)
+    for i in range(10):
+        recorder.write(_frame(i), timestamp_ms=i * 1000 / 60)
+
+    # 2 s at a measured 60 fps, with 1.5x headroom
+    assert recorder.capacity == 180
+    recorder.close()
+    assert len(SessionReader(recorder.path)) == 10
+
+
+def test_dump_keeps_last_seconds_by_timestamp(tmp_path):
+    recorder = SessionRecorder(str(tmp_path / "ring.frames.npy"), seconds=1, fps=30)
+    for i in range(45):
+        # Capture runs at about half the sized rate (66 ms per frame), so
+        # the 30 slots span ~1.9 s
+        recorder.write(_frame(i), timestamp_ms=i * 66)
+    assert len(SessionReader(recorder.path)) == 30
+
+    path = recorder.dump(str(tmp_path / "dump.frames.npy"), background=False)
+    reader = SessionReader(path)
+    # Only frames within 1000 ms of the newest: 15 intervals of 66 ms
+    assert len(reader) == 16
+    assert reader.timestamps_ms[-1] == 44 * 66
+    assert reader.timestamps_ms[-1] - reader.timestamps_ms[0] <= 1000
+
+
+def test_writes_during_background_dump_keep_newest_frames(tmp_path):
+    recorder = SessionRecorder(str(tmp_path / "ring.frames.npy"), seconds=1, fps=30)
+    for i in range(30):
+        recorder.write(_frame(i), timestamp_ms=i * 1000 / 30)
+
+    path = recorder.dump(str(tmp_path / "dump.frames.npy"))
+    # Overwrite the whole ring while the dump runs
+    for i in range(30, 60):
+        recorder.write(_frame(i), timestamp_ms=i * 1000 / 30)
+    recorder.close()
+
+    reader = SessionReader(path)
+    values = []
+    while True:
+        ret, frame = reader.read()
+        if not ret:
+            break
+        values.append(int(frame[0, 0, 0]))
+    # The writer copied each slot into the dump before overwriting it
+    assert values == list(range(30))
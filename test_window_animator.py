@@ -0,0 +1,100 @@
+import pytest
+from virtual_window import VirtualDesktop, VirtualWindow
+from window_animator import EASINGS, WindowAnimator
+
+
+def _window():
+    return VirtualWindow(100, 100, 300, 200, "Test", (200, 200, 200))
+
+
+@pytest.mark.parametrize('easing', EASINGS)
+def test_easing_endpoints(easing):
+    animator = WindowAnimator()
+    window = _window()
+    animator.animate_to(window, x=200, width=400, duration=0.5, easing=easing, now=10.0)
+
+    animator.step(10.0)
+    assert (window.x, window.width) == (100, 300)
+
+    animator.step(10.25)
+    assert 100 <= window.x <= 200
+
+    animator.step(10.5)
+    assert (window.x, window.y, window.width, window.height) == (200, 100, 400, 200)
+    assert not animator.is_animating(window)
+
+
+def test_overlapping_animations_coalesce():
+    animator = WindowAnimator()
+    window = _window()
+    animator.animate_by(window, dx=50, duration=0.2, easing='linear', now=0.0)
+    animator.step(0.1)
+    assert window.x == 125
+
+    # A second swipe mid-flight adds to the pending target and continues
+    # from the current position instead of jumping back
+    animator.animate_by(window, dx=50, duration=0.2, easing='linear', now=0.1)
+    assert len(animator.windows) == 1
+    assert animator.target_of(window)[0] == 200
+
+    animator.step(0.1)
+    assert window.x == 125
+    animator.step(0.3)
+    assert window.x == 200
+
+
+def test_cancel_leaves_window_in_place():
+    animator = WindowAnimator()
+    window = _window()
+    animator.animate_by(window, dx=100, duration=1.0, easing='linear', now=0.0)
+    animator.step(0.5)
+    animator.cancel(window)
+    animator.step(1.0)
+    assert window.x == 150
+    assert animator.windows == []
+
+
+def test_drag_cancels_animation():
+    desktop = VirtualDesktop()
+    window = desktop.windows[-1]
+    desktop.active_window = window
+    desktop.handle_swipe('right', now=0.0)
+    desktop.render(0.1)
+
+    # Pinch on the title bar and drag
+    desktop.handle_cursor(window.x + 20, window.y + 10, True)
+    desktop.handle_cursor(window.x + 20, window.y + 60, True)
+    dragged_to = (window.x, window.y)
+    desktop.render(1.0)
+
+    assert not desktop.animator.is_animating(window)
+    assert (window.x, window.y) == dragged_to
+
+
+def test_gestures_follow_the_render_clock():
+    # Animations and status messages started without a time run on the
+    # clock passed to render(), not the wall clock
+    desktop = VirtualDesktop()
+    desktop.handle_swipe('right')  # Activates the front window
+    desktop.handle_swipe('right')
+    window = desktop.active_window
+    start_x = window.x
+
+    for i in range(60):
+        desktop.render(i / 30)
+
+    assert window.x == start_x + 50
+    assert not desktop.animator.is_animating(window)
+    assert desktop.message_expires == pytest.approx(2.0)
+
+
+def test_over_budget_snaps_one_animation_per_frame():
+    animator = WindowAnimator(frame_budget_ms=1.0)
+    windows = [_window() for _ in range(3)]
+    for window in windows:
+        animator.animate_by(window, dx=100, duration=1.0, easing='linear', now=0.0)
+
+    animator.step(0.6)
+    animator.end_frame(5.0)
+    animator.step(0.61)
+    assert len(animator.windows) == 2
@@ -1,6 +1,8 @@
+import time
 import cv2
 import numpy as np
 from typing import List, Tuple, Optional
+from window_animator import WindowAnimator
 
 class VirtualWindow:
     """Represents a draggable window in the virtual desktop"""
@@ -57,44 +59,84 @@ class VirtualDesktop:
         self.active_window: Optional[VirtualWindow] = None
         self.dragging = False
         self.drag_offset = (0, 0)
+        self.animator = WindowAnimator()
+        
+        # Cached layers: the gradient, and the background plus the windows
+        # below the lowest animating one (keyed by those windows' state)
+        self._background = self._create_background()
+        self._static_layer = None
+        self._static_key = None
         
         # Create some demo windows
         self._create_demo_windows()
         
         # Status message
         self.status_message = "Welcome! Use hand gestures to control windows"
-        self.message_timer = 0
+        # Deadline on the clock passed to render(); None = set on next render
+        self.message_expires: Optional[float] = 0.0
+        self.message_duration = 0.0
         
     def _create_demo_windows(self):
         """Create initial demo windows"""
+        self.animator.clear()
         self.windows = [
             VirtualWindow(100, 100, 300, 200, "Notes", (230, 216, 173)),
             VirtualWindow(450, 150, 350, 250, "Browser", (173, 216, 230)),
             VirtualWindow(250, 350, 280, 180, "Music", (216, 191, 216)),
         ]
     
-    def render(self) -> np.ndarray:
+    def _create_background(self) -> np.ndarray:
+        """Vertical gradient background"""
+        intensity = (60 + np.arange(self.height) / self.height * 40).astype(np.uint8)
+        return np.repeat(np.repeat(intensity[:, None, None], self.width, axis=1), 3, axis=2)
+    
+    @staticmethod
+    def _window_state(window):
+        return (window.x, window.y, window.width, window.height, window.title,
+                window.color, window.is_active, window.is_minimized)
+    
+    def render(self, now: Optional[float] = None) -> np.ndarray:
 
-        # Create desktop background
-        desktop = np.ones((self.height, self.width, 3), dtype=np.uint8) * 60
+        if now is None:
+            now = time.monotonic()
         
-        # Draw a gradient background
-        for i in range(self.height):
-            intensity = int(60 + (i / self.height) * 40)
-            desktop[i, :] = (intensity, intensity, intensity)
+        # Advance window animations
+        start = time.perf_counter()
+        animating = self.animator.step(now)
+        animation_seconds = time.perf_counter() - start
         
-        # Draw all non-minimized windows (back to front)
-        for window in self.windows:
+        # Windows below the lowest animating one come from the cached layer;
+        # only the animating windows and those above them are redrawn
+        first_dynamic = min((self.windows.index(w) for w in animating if w in self.windows),
+                            default=len(self.windows))
+        static_key = (len(self.windows),
+                      [self._window_state(w) for w in self.windows[:first_dynamic]])
+        if static_key != self._static_key:
+            self._static_layer = self._background.copy()
+            for window in self.windows[:first_dynamic]:
+                if not window.is_minimized:
+                    self._draw_window(self._static_layer, window)
+            self._static_key = static_key
+        
+        desktop = self._static_layer.copy()
+        for window in self.windows[first_dynamic:]:
             if not window.is_minimized:
+                start = time.perf_counter()
                 self._draw_window(desktop, window)
+                if window in animating:
+                    animation_seconds += time.perf_counter() - start
+        
+        if animating:
+            self.animator.end_frame(animation_seconds * 1000)
         
         # Draw taskbar
         self._draw_taskbar(desktop)
         
         # Draw status message
-        if self.message_timer > 0:
+        if self.message_expires is None:
+            self.message_expires = now + self.message_duration
+        if now < self.message_expires:
             self._draw_status(desktop)
-            self.message_timer -= 1
         
         return desktop
     
@@ -205,6 +247,7 @@ class VirtualDesktop:
         
         # Update dragging
         if self.dragging and self.active_window:
+            self.animator.cancel(self.active_window)
             new_x = x - self.drag_offset[0]
             new_y = y - self.drag_offset[1]
             self.active_window.set_position(new_x, new_y)
@@ -220,8 +263,8 @@ class VirtualDesktop:
                 if w != window:
                     w.is_active = False
     
-    def handle_swipe(self, direction):
-        """Handle swipe gestures"""
+    def handle_swipe(self, direction, now: Optional[float] = None):
+        """Handle swipe gestures; `now` is the clock later passed to render()"""
         if not self.active_window:
             # Activate first window if none active
             if self.windows:
@@ -229,35 +272,39 @@ class VirtualDesktop:
                 self.active_window.is_active = True
             return
         
+        # Windows glide to their new position over a few frames
         move_amount = 50
         if direction == 'left':
-            self.active_window.move(-move_amount, 0)
-            self.set_status(f"Moved {self.active_window.title} left")
+            self.animator.animate_by(self.active_window, dx=-move_amount, now=now)
+            self.set_status(f"Moved {self.active_window.title} left", now=now)
         elif direction == 'right':
-            self.active_window.move(move_amount, 0)
-            self.set_status(f"Moved {self.active_window.title} right")
+            self.animator.animate_by(self.active_window, dx=move_amount, now=now)
+            self.set_status(f"Moved {self.active_window.title} right", now=now)
         elif direction == 'up':
-            self.active_window.move(0, -move_amount)
-            self.set_status(f"Moved {self.active_window.title} up")
+            self.animator.animate_by(self.active_window, dy=-move_amount, now=now)
+            self.set_status(f"Moved {self.active_window.title} up", now=now)
         elif direction == 'down':
-            self.active_window.move(0, move_amount)
-            self.set_status(f"Moved {self.active_window.title} down")
+            self.animator.animate_by(self.active_window, dy=move_amount, now=now)
+            self.set_status(f"Moved {self.active_window.title} down", now=now)
     
-    def handle_push(self):
+    def handle_push(self, now: Optional[float] = None):
         """Handle push gesture - maximize window"""
         if self.active_window:
-            self.active_window.width = min(self.active_window.width + 50, 600)
-            self.active_window.height = min(self.active_window.height + 40, 400)
-            self.set_status(f"Enlarged {self.active_window.title}")
+            _, _, width, height = self.animator.target_of(self.active_window)
+            self.animator.animate_to(self.active_window, width=min(width + 50, 600),
+                                     height=min(height + 40, 400), now=now)
+            self.set_status(f"Enlarged {self.active_window.title}", now=now)
     
-    def handle_pull(self):
+    def handle_pull(self, now: Optional[float] = None):
         """Handle pull gesture - minimize window"""
         if self.active_window:
-            self.active_window.width = max(self.active_window.width - 50, 200)
-            self.active_window.height = max(self.active_window.height - 40, 150)
-            self.set_status(f"Shrunk {self.active_window.title}")
+            _, _, width, height = self.animator.target_of(self.active_window)
+            self.animator.animate_to(self.active_window, width=max(width - 50, 200),
+                                     height=max(height - 40, 150), now=now)
+            self.set_status(f"Shrunk {self.active_window.title}", now=now)
     
-    def set_status(self, message):
-        """Set status message"""
+    def set_status(self, message, duration=2.0, now: Optional[float] = None):
+        """Set status message, shown for `duration` seconds from `now` (default: next render)"""
         self.status_message = message
-        self.message_timer = 60  # Show for 60 frames (2 seconds)
\ No newline at end of file
+        self.message_duration = duration
+        self.message_expires = None if now is None else now + duration
\ No newline at end of file
@@ -0,0 +1,153 @@
+import time
+import numpy as np
+from typing import List, Optional
+
+EASINGS = ['linear', 'ease_in', 'ease_out', 'ease_in_out']
+
+
+def _ease_all(progress):
+    """Every easing curve evaluated at once, stacked in EASINGS order"""
+    return np.stack([
+        progress,
+        progress**2,
+        1 - (1 - progress)**2,
+        progress**2 * (3 - 2 * progress),
+    ])
+
+
+class WindowAnimator:
+    """
+    Tweens window position and size
+
+    All active animations live in parallel arrays (one row per window of
+    x, y, width, height) and are advanced together in one vectorized step
+    per frame. Starting a new animation on a window that is already
+    animating continues from where it currently is.
+
+    Times are in seconds on whatever clock is passed to step(); animations
+    started without an explicit `now` begin at the next step, so callers
+    with their own clock stay consistent.
+    """
+
+    def __init__(self, frame_budget_ms=4.0):
+
+        self.windows: List = []
+        self.start = np.zeros((0, 4))
+        self.target = np.zeros((0, 4))
+        self.start_time = np.zeros(0)
+        self.duration = np.zeros(0)
+        self.easing = np.zeros(0, dtype=np.int64)
+
+        # Time the animation work may take each frame: the vectorized step
+        # plus redrawing the windows that moved (see end_frame)
+        self.frame_budget_ms = frame_budget_ms
+        self.last_frame_ms = 0.0
+        self.over_budget_frames = 0
+        self.now: Optional[float] = None  # Clock value of the last step
+
+    @staticmethod
+    def _geometry(window):
+        return [window.x, window.y, window.width, window.height]
+
+    def is_animating(self, window) -> bool:
+        return window in self.windows
+
+    def target_of(self, window) -> List[float]:
+        """Where the window will end up once its animation finishes"""
+        if window in self.windows:
+            return list(self.target[self.windows.index(window)])
+        return self._geometry(window)
+
+    def animate_to(self, window, x=None, y=None, width=None, height=None,
+                   duration=0.25, easing='ease_out', now: Optional[float] = None):
+        """Animate a window towards new geometry; omitted values stay at their target"""
+        if now is None:
+            now = np.nan  # Start on the next step
+
+        target = self.target_of(window)
+        for i, value in enumerate((x, y, width, height)):
+            if value is not None:
+                target[i] = value
+
+        row = [self._geometry(window)]
+        if window in self.windows:
+            # Coalesce: restart from the current geometry towards the new target
+            i = self.windows.index(window)
+            self.start[i] = row[0]
+            self.target[i] = target
+            self.start_time[i] = now
+            self.duration[i] = duration
+            self.easing[i] = EASINGS.index(easing)
+        else:
+            self.windows.append(window)
+            self.start = np.vstack([self.start, row])
+            self.target = np.vstack([self.target, [target]])
+            self.start_time = np.append(self.start_time, now)
+            self.duration = np.append(self.duration, duration)
+            self.easing = np.append(self.easing, EASINGS.index(easing))
+
+    def animate_by(self, window, dx=0, dy=0, dwidth=0, dheight=0, **kwargs):
+        """Animate relative to the current target, so repeated gestures add up"""
+        x, y, width, height = self.target_of(window)
+        self.animate_to(window, x + dx, y + dy, width + dwidth, height + dheight, **kwargs)
+
+    def cancel(self, window):
+        """Stop animating a window, leaving it where it is"""
+        if window in self.windows:
+            self._remove(np.array([w is window for w in self.windows]))
+
+    def clear(self):
+        self._remove(np.ones(len(self.windows), dtype=bool))
+
+    def _remove(self, mask):
+        keep = ~mask
+        self.windows = [w for w, k in zip(self.windows, keep) if k]
+        self.start = self.start[keep]
+        self.target = self.target[keep]
+        self.start_time = self.start_time[keep]
+        self.duration = self.duration[keep]
+        self.easing = self.easing[keep]
+
+    def step(self, now: Optional[float] = None) -> List:
+        """
+        Advance every animation to `now`
+
+        Returns:
+            Windows whose geometry changed this frame
+        """
+        if not self.windows:
+            return []
+        if now is None:
+            now = time.monotonic()
+        self.now = now
+        self.start_time = np.where(np.isnan(self.start_time), now, self.start_time)
+
+        progress = np.clip((now - self.start_time) / np.maximum(self.duration, 1e-6), 0.0, 1.0)
+        eased = _ease_all(progress)[self.easing, np.arange(len(progress))]
+        geometry = np.rint(self.start + (self.target - self.start) * eased[:, None]).astype(int)
+
+        moved = list(self.windows)
+        for window, (x, y, width, height) in zip(moved, geometry.tolist()):
+            window.x, window.y, window.width, window.height = x, y, width, height
+
+        self._remove(progress >= 1.0)
+        return moved
+
+    def end_frame(self, elapsed_ms):
+        """
+        Report how long this frame's animation work took
+
+        `elapsed_ms` should cover step() plus redrawing the windows it
+        returned, not the rest of the frame. On each frame over budget, the
+        most advanced animation that is at least halfway done snaps to its
+        target on the next step, so the load drops one window at a time.
+        """
+        self.last_frame_ms = elapsed_ms
+        if elapsed_ms <= self.frame_budget_ms or not self.windows:
+            return
+
+        self.over_budget_frames += 1
+        progress = (self.now - self.start_time) / np.maximum(self.duration, 1e-6)
+        i = int(np.argmax(progress))
+        if progress[i] >= 0.5:
+            self.start_time[i] = -np.inf